@@ -5,14 +5,32 @@ Filename: attendance_system.py
 Description: A simple CLI attendance manager using dictionaries and JSON persistence.
 """
 
+import argparse
 import json
-from datetime import datetime
 import csv
+import io
+import os
+import pickle
+import re
+from bisect import insort
+from collections import Counter
+from functools import lru_cache
+
+# orjson is optional: it is much faster than the standard json module when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ----------------------------------------------------------
 # File to store data persistently
 # ----------------------------------------------------------
 DATA_FILE = "attendance_data.json"
+# Faster, Python-only alternative used when started with --binary.
+# In that mode loading reads whichever of the two files was saved most recently;
+# pickles are never loaded otherwise, since unpickling can run arbitrary code.
+BINARY_DATA_FILE = "attendance_data.pkl"
+binary_mode = False
 
 # ----------------------------------------------------------
 # Data Structures
@@ -31,20 +49,147 @@ students = {
     "Maryam Ali": "Class E"
 }
 
-# Attendance records: { "YYYY-MM-DD": {"Ali Khan": "Present", ...}, ... }
+# Attendance records: { "YYYY-MM-DD": {"Ali Khan": "P", ...}, ... }
+# Statuses are stored as single-letter codes; a missing name means "Not recorded".
+# Days read from the data file stay packed in _saved_rows until first used (see get_day).
 attendance = {}
 
+# Saved matrix rows not yet decoded: { "YYYY-MM-DD": "PA.P..." }, one column per _saved_names entry
+_saved_rows = {}
+_saved_names = []
+
+# Status codes and their display names
+_STATUS = {"P": "Present", "A": "Absent"}
+# Placeholder code used in the saved matrix for "Not recorded"
+_NOT_RECORDED = "."
+# Display name for every code that can appear in a packed row of saved status codes
+_ROW_STATUS = {"P": "Present", "A": "Absent", _NOT_RECORDED: "Not recorded"}
+# Status values accepted from older versions of the data file; anything else is dropped
+_LEGACY_STATUS = {"Present": "P", "Absent": "A", "P": "P", "A": "A"}
+# Valid status codes, used to keep each saved matrix cell a single character
+_CODES = {"P": "P", "A": "A"}
+# Status values accepted when importing attendance from a CSV file (case-insensitive)
+_IMPORT_STATUS = {"p": "P", "a": "A", "present": "P", "absent": "A"}
+
+# Characters that force a CSV field to be quoted
+_CSV_SPECIAL = re.compile(r'[,"\r\n]')
+# A batch of attendance choices: one p/a/s letter per student
+_PAS_SEQ = re.compile(r"[pas]+")
+
+# Student names kept in alphabetical order as students are added
+_sorted_names = sorted(students)
+
+# Absence counts kept in step with attendance so statistics need no scanning.
+# They are built on first use, since that means decoding every saved day.
+_absences_by_student = Counter()  # { "Ali Khan": 3, ... }
+_absence_index_ready = False
+
 
 # ----------------------------------------------------------
 # Utility / Validation Functions
 # ----------------------------------------------------------
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+@lru_cache(maxsize=512)
 def is_valid_date(date_str):
     """Return True if date_str is in YYYY-MM-DD and is a real date."""
-    try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-        return True
-    except ValueError:
+    # Checked by hand rather than with datetime.strptime, which is much slower
+    if len(date_str) != 10 or date_str[4] != "-" or date_str[7] != "-":
         return False
+    digits = date_str[:4] + date_str[5:7] + date_str[8:]
+    if not (digits.isascii() and digits.isdigit()):
+        return False
+    year, month, day = int(date_str[:4]), int(date_str[5:7]), int(date_str[8:])
+    if year < 1 or not 1 <= month <= 12:
+        return False
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 1 <= day <= 29
+    return 1 <= day <= _DAYS_IN_MONTH[month - 1]
+
+
+def has_date(date_str):
+    """Return True if any attendance has been recorded or loaded for date_str."""
+    return date_str in attendance or date_str in _saved_rows
+
+
+def decode_row(row):
+    """Return the attendance record held in a packed saved row."""
+    return {n: c for n, c in zip(_saved_names, row) if c in _CODES}
+
+
+def get_day(date_str):
+    """Return the attendance record for a date to change, decoding or creating it on first use."""
+    day = attendance.get(date_str)
+    if day is None:
+        day = decode_row(_saved_rows.pop(date_str, ""))
+        attendance[date_str] = day
+    return day
+
+
+def load_all_days():
+    """Decode every saved day that has not been used yet."""
+    for date_str in list(_saved_rows):
+        get_day(date_str)
+
+
+def ensure_absence_index():
+    """Build the absence counts from the full attendance records if not done yet."""
+    global _absence_index_ready
+    if _absence_index_ready:
+        return
+    load_all_days()
+    _absences_by_student.clear()
+    for day in attendance.values():
+        _absences_by_student.update([name for name, code in day.items() if code == "A"])
+    _absence_index_ready = True
+
+
+def encode_day(day):
+    """Return a day's record as one status code per student, in the same order as _sorted_names."""
+    # Unknown values become "Not recorded" so the row always lines up with the names
+    return "".join([_CODES.get(day.get(name), _NOT_RECORDED) for name in _sorted_names])
+
+
+def day_statuses(date_str):
+    """Return display statuses for a date, in the same order as _sorted_names."""
+    row = _saved_rows.get(date_str)
+    if row is not None and _saved_names == _sorted_names:
+        # Still packed as loaded: map each code straight to its display name, one per student
+        return list(map(_ROW_STATUS.__getitem__, row))
+    # Read-only: a saved row is decoded for display but stays packed in _saved_rows
+    day = attendance.get(date_str)
+    if day is None:
+        day = decode_row(_saved_rows.get(date_str, ""))
+    day_get = day.get
+    status_get = _STATUS.get
+    return [status_get(day_get(name), "Not recorded") for name in _sorted_names]
+
+
+def set_status(date_str, name, code):
+    """Record a student's status code for a date and update the absence counts."""
+    day_record = get_day(date_str)
+    previous = day_record.get(name)
+    day_record[name] = code
+    if not _absence_index_ready:
+        return
+    if code == "A" and previous != "A":
+        _absences_by_student[name] += 1
+    elif previous == "A" and code != "A":
+        _absences_by_student[name] -= 1
+
+
+def write_file_bytes(filename, data):
+    """Write data to filename straight through a file descriptor, skipping Python's buffered io layers."""
+    # O_BINARY stops Windows from translating line endings that are already in data
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(filename, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def prompt_nonempty(prompt_text):
@@ -59,25 +204,107 @@ def prompt_nonempty(prompt_text):
 # ----------------------------------------------------------
 # Persistence (Load and Save Data)
 # ----------------------------------------------------------
+def parse_saved_data(data):
+    """Validate loaded data and return (students, saved names, saved rows, decoded days, bad row count).
+
+    Raises TypeError if the data does not have the shape save_data writes.
+    """
+    if not isinstance(data, dict):
+        raise TypeError("expected a dict of students and attendance")
+    loaded_students = data.get("students", {})
+    if not isinstance(loaded_students, dict) or not all(
+        isinstance(name, str) and isinstance(group, str) for name, group in loaded_students.items()
+    ):
+        raise TypeError("students must map names to class groups")
+
+    saved_names, saved_rows, days, bad_rows = [], {}, {}, 0
+    if "matrix" in data:
+        # Columnar layout: one row of status codes per date, one column per name.
+        # Rows are only decoded when their date is used.
+        saved_names, dates, matrix = data["names"], data["dates"], data["matrix"]
+        if not (isinstance(saved_names, list) and isinstance(dates, list) and isinstance(matrix, list)):
+            raise TypeError("names, dates and matrix must be lists")
+        for date_str, row in zip(dates, matrix):
+            # Rows must hold exactly one known code per name to decode or display correctly
+            if isinstance(row, str) and len(row) == len(saved_names) and not row.strip("PA" + _NOT_RECORDED):
+                saved_rows[date_str] = row
+            else:
+                bad_rows += 1
+    else:
+        # Nested layout, written by pickle mode and older versions of the JSON file
+        loaded_days = data.get("attendance", {})
+        if not isinstance(loaded_days, dict) or not all(isinstance(day, dict) for day in loaded_days.values()):
+            raise TypeError("attendance must map dates to records")
+        for date_str, day in loaded_days.items():
+            days[date_str] = {n: _LEGACY_STATUS[v] for n, v in day.items() if v in _LEGACY_STATUS}
+    return loaded_students, saved_names, saved_rows, days, bad_rows
+
+
 def load_data():
-    """Load existing student and attendance data from a JSON file."""
-    global students, attendance
+    """Load existing student and attendance data from the data file."""
+    global students, attendance, _absence_index_ready
+    # Sessions may switch between --binary and JSON, so find out which file holds the latest changes
+    pickle_is_newer = os.path.exists(BINARY_DATA_FILE) and (
+        not os.path.exists(DATA_FILE) or os.path.getmtime(BINARY_DATA_FILE) > os.path.getmtime(DATA_FILE)
+    )
+    if pickle_is_newer and not binary_mode:
+        print(f"Warning: {BINARY_DATA_FILE} has newer data than {DATA_FILE}. Run with --binary to load it.")
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            students.update(data.get("students", {}))
-            attendance.update(data.get("attendance", {}))
-            print(f"Loaded data: {len(students)} students, {len(attendance)} dates.")
+        if binary_mode and pickle_is_newer:
+            with open(BINARY_DATA_FILE, "rb") as f:
+                data = pickle.load(f)
+        else:
+            with open(DATA_FILE, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw.decode("utf-8"))
+        # Check everything before touching the globals, so a bad file leaves the dummy data intact
+        loaded_students, saved_names, saved_rows, days, bad_rows = parse_saved_data(data)
     except FileNotFoundError:
         print("No saved data found — starting with 10 dummy students.")
-    except json.JSONDecodeError:
+        return
+    except (json.JSONDecodeError, pickle.UnpicklingError, EOFError, KeyError, TypeError):
         print("Warning: Data file corrupted. Starting with dummy data.")
+        return
+
+    if bad_rows:
+        print(f"Warning: skipped {bad_rows} malformed attendance rows.")
+    students.update(loaded_students)
+    _saved_names[:] = saved_names
+    _saved_rows.update(saved_rows)
+    attendance.update(days)
+    _sorted_names[:] = sorted(students)
+    _absence_index_ready = False
+    print(f"Loaded data: {len(students)} students, {len(attendance) + len(_saved_rows)} dates.")
 
 
 def save_data():
-    """Save student and attendance data to a JSON file."""
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump({"students": students, "attendance": attendance}, f, ensure_ascii=False, indent=2)
+    """Save student and attendance data to the data file."""
+    if binary_mode:
+        load_all_days()
+        with open(BINARY_DATA_FILE, "wb") as f:
+            pickle.dump({"students": students, "attendance": attendance}, f, protocol=5)
+        print(f"Data saved to {BINARY_DATA_FILE}.")
+        return
+
+    # Store attendance column-wise so each name is written once, not once per date.
+    # Days never used this session are written back as loaded, without decoding them.
+    if _saved_names != _sorted_names:
+        load_all_days()
+    dates = sorted(attendance.keys() | _saved_rows.keys())
+    matrix = []
+    for d in dates:
+        row = _saved_rows.get(d)
+        if row is None:
+            row = encode_day(attendance[d])
+        matrix.append(row)
+    data = {"students": students, "names": _sorted_names, "dates": dates, "matrix": matrix}
+    # Serialise up front so the file gets one write instead of one per token
+    if orjson:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(DATA_FILE, "wb") as f:
+        f.write(payload)
     print(f"Data saved to {DATA_FILE}.")
 
 
@@ -93,6 +320,7 @@ def add_student():
         return
     group = prompt_nonempty("Enter class group (e.g., Class A): ")
     students[name] = group
+    insort(_sorted_names, name)
     print(f"Added student: {name} (Group: {group})")
 
 
@@ -102,8 +330,26 @@ def list_students():
     if not students:
         print("No students have been added yet.")
         return
-    for i, (name, group) in enumerate(sorted(students.items(), key=lambda x: x[0]), start=1):
-        print(f"{i}. {name} — {group}")
+    print("\n".join([f"{i}. {name} — {students[name]}" for i, name in enumerate(_sorted_names, start=1)]))
+
+
+def mark_attendance_individually(date_str, day_record):
+    """Prompt for each student's status one at a time."""
+    for name in _sorted_names:
+        existing = day_record.get(name)
+        prompt = f"{name} [{_STATUS.get(existing, 'Not recorded')}] (p/a/s): "
+        while True:
+            choice = input(prompt).strip().lower()
+            if choice == "p":
+                set_status(date_str, name, "P")
+                break
+            elif choice == "a":
+                set_status(date_str, name, "A")
+                break
+            elif choice == "s":
+                break
+            else:
+                print("Invalid input. Use 'p' for present, 'a' for absent, 's' to skip.")
 
 
 def record_attendance():
@@ -118,44 +364,43 @@ def record_attendance():
         return
 
     # Create an empty record for the date if not present
-    day_record = attendance.setdefault(date_str, {})
+    day_record = get_day(date_str)
 
     print(f"\nMarking attendance for {date_str}. Enter 'p' for Present, 'a' for Absent, or 's' to skip.\n")
-    for name in sorted(students.keys()):
-        existing = day_record.get(name)
-        prompt = f"{name} [{existing if existing else 'Not recorded'}] (p/a/s): "
-        while True:
-            choice = input(prompt).strip().lower()
-            if choice == "p":
-                day_record[name] = "Present"
-                break
-            elif choice == "a":
-                day_record[name] = "Absent"
-                break
-            elif choice == "s":
-                break
-            else:
-                print("Invalid input. Use 'p' for present, 'a' for absent, 's' to skip.")
+    rows = zip(_sorted_names, day_statuses(date_str))
+    print("\n".join([f"{i}. {name} [{status}]" for i, (name, status) in enumerate(rows, start=1)]))
+
+    # One letter per student in the order above; whitespace and commas are ignored
+    while True:
+        raw = input("\nEnter all statuses in order (e.g. 'ppaps'), or press Enter to mark one by one: ")
+        seq = "".join(raw.split()).replace(",", "").lower()
+        if not seq:
+            mark_attendance_individually(date_str, day_record)
+            break
+        if len(seq) == len(_sorted_names) and _PAS_SEQ.fullmatch(seq):
+            for name, choice in zip(_sorted_names, seq):
+                if choice != "s":
+                    set_status(date_str, name, "P" if choice == "p" else "A")
+            break
+        print(f"Invalid input. Enter exactly {len(_sorted_names)} letters using only 'p', 'a' or 's'.")
 
-    attendance[date_str] = day_record
     print(f"Attendance recorded for {date_str}.")
 
 
 def view_attendance_by_date():
     """View attendance details for a specific date."""
     print("\n--- View Attendance by Date ---")
-    if not attendance:
+    if not attendance and not _saved_rows:
         print("No attendance records available.")
         return
     date_str = prompt_nonempty("Enter date (YYYY-MM-DD): ")
-    if date_str not in attendance:
+    if not has_date(date_str):
         print("No records for that date.")
         return
 
     print(f"\nAttendance for {date_str}:")
-    for name in sorted(students.keys()):
-        status = attendance[date_str].get(name, "Not recorded")
-        print(f"- {name}: {status}")
+    statuses = day_statuses(date_str)
+    print("\n".join([f"- {name}: {status}" for name, status in zip(_sorted_names, statuses)]))
 
 
 def search_student_record():
@@ -170,29 +415,72 @@ def search_student_record():
         return
 
     print(f"\nAttendance history for {name} (Group: {students[name]}):")
-    if not attendance:
+    if not attendance and not _saved_rows:
         print("No attendance recorded yet.")
         return
-    for date_str in sorted(attendance.keys()):
-        status = attendance[date_str].get(name, "Not recorded")
-        print(f"{date_str}: {status}")
+    ensure_absence_index()
+    status_get = _STATUS.get
+    # Build the whole history first so it is printed in one call
+    print("\n".join([
+        f"{date_str}: {status_get(day.get(name), 'Not recorded')}"
+        for date_str, day in sorted(attendance.items())
+    ]))
+    print(f"Total absences: {_absences_by_student[name]}")
 
 
 def export_attendance_csv():
     """Export attendance for a specific date to a CSV file."""
     date_str = prompt_nonempty("Enter date to export (YYYY-MM-DD): ")
-    if date_str not in attendance:
+    if not has_date(date_str):
         print("No records for that date.")
         return
     filename = f"attendance_{date_str}.csv"
-    with open(filename, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
+    statuses = day_statuses(date_str)
+    rows = [[name, students[name], status] for name, status in zip(_sorted_names, statuses)]
+    # Build the whole file in memory, then write it out in one go.
+    # Plain joins are much faster than csv.writer, but only safe when no field needs quoting.
+    if _CSV_SPECIAL.search("".join([name + students[name] for name in _sorted_names])):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
         writer.writerow(["Name", "Class Group", "Status"])
-        for name in sorted(students.keys()):
-            writer.writerow([name, students[name], attendance[date_str].get(name, "Not recorded")])
+        writer.writerows(rows)
+        payload = buf.getvalue()
+    else:
+        lines = ["Name,Class Group,Status"]
+        lines.extend([",".join(row) for row in rows])
+        lines.append("")
+        payload = "\r\n".join(lines)
+    write_file_bytes(filename, payload.encode("utf-8"))
     print(f"Exported attendance to {filename}.")
 
 
+def record_attendance_bulk():
+    """Import attendance for many dates from a CSV file of date,name,status rows."""
+    print("\n--- Import Attendance (CSV) ---")
+    path = prompt_nonempty("Enter path to CSV file: ")
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as csvfile:
+            rows = list(csv.reader(csvfile))
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Could not read file: {e}")
+        return
+
+    imported = skipped = 0
+    for row in rows:
+        if len(row) != 3:
+            skipped += 1
+            continue
+        date_str, name, status = (field.strip() for field in row)
+        code = _IMPORT_STATUS.get(status.lower())
+        if code and name in students and is_valid_date(date_str):
+            set_status(date_str, name, code)
+            imported += 1
+        else:
+            skipped += 1
+    # A header row such as "date,name,status" is simply counted as skipped
+    print(f"Imported {imported} attendance records from {path} ({skipped} rows skipped).")
+
+
 # ----------------------------------------------------------
 # Menu & Main Function
 # ----------------------------------------------------------
@@ -206,11 +494,20 @@ def show_menu():
     print("5. List students")
     print("6. Export attendance (CSV)")
     print("7. Save & exit")
+    print("8. Import attendance (CSV)")
     print("0. Exit without saving")
 
 
 def main():
     """Main function to run the CLI-based attendance system."""
+    global binary_mode
+    parser = argparse.ArgumentParser(description="Bright Minds Academy attendance system")
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help=f"fast mode: save to {BINARY_DATA_FILE} with pickle instead of {DATA_FILE} (Python-only format)",
+    )
+    binary_mode = parser.parse_args().binary
     load_data()
     while True:
         show_menu()
@@ -231,6 +528,8 @@ def main():
             save_data()
             print("Exiting. Goodbye!")
             break
+        elif choice == "8":
+            record_attendance_bulk()
         elif choice == "0":
             print("Exiting without saving. Goodbye!")
             break